@@ -1,12 +1,22 @@
 from nltk.corpus import stopwords
 from nltk.tokenize import word_tokenize, sent_tokenize
-from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.feature_extraction.text import CountVectorizer, TfidfTransformer
+from concurrent.futures import ProcessPoolExecutor
+from scipy.sparse import csr_matrix, vstack
+import numpy as np
+import scipy
+import sklearn
 import PyPDF2
 import docx
 import os
 import random
 import nltk
-from typing import List, Optional
+import hashlib
+import pickle
+import re
+import sys
+from collections import Counter, OrderedDict
+from typing import Any, Callable, List, Optional
 from datetime import datetime
 
 class EstudioError(Exception):
@@ -21,8 +31,345 @@ class ProcesamientoError(EstudioError):
     """Se lanza cuando hay un error en el procesamiento del texto"""
     pass
 
+# Los valores en disco son pickles de objetos de estas bibliotecas; al actualizarlas se invalidan.
+_VERSION_BIBLIOTECAS = (f"python={sys.version_info[0]}.{sys.version_info[1]};numpy={np.__version__};"
+                        f"scipy={scipy.__version__};scikit-learn={sklearn.__version__}")
+
+def _estimar_tamano(valor: Any) -> int:
+    """Cota inferior del tamaño serializado de un valor, calculada sin serializarlo"""
+    if isinstance(valor, (str, bytes)):
+        return len(valor)
+    if isinstance(valor, (list, tuple, set)):
+        return sum(_estimar_tamano(elemento) for elemento in valor)
+    if isinstance(valor, dict):
+        return sum(_estimar_tamano(k) + _estimar_tamano(v) for k, v in valor.items())
+    if isinstance(valor, np.ndarray):
+        return valor.nbytes
+    if all(hasattr(valor, atributo) for atributo in ("data", "indices", "indptr")):
+        return valor.data.nbytes + valor.indices.nbytes + valor.indptr.nbytes
+    return 0
+
+class CacheResultados:
+    """
+    Caché LRU acotada por tamaño para los resultados del análisis.
+
+    Los valores se guardan serializados con pickle, de modo que el tamaño de
+    cada entrada se conoce con exactitud y los resultados devueltos nunca
+    comparten estado con los almacenados. Opcionalmente se persiste en disco
+    para reutilizar resultados entre ejecuciones; ese nivel también está acotado
+    y descarta primero los archivos usados hace más tiempo.
+
+    Args:
+        tamano_maximo (int): Tamaño máximo en bytes de la caché en memoria
+        directorio (Optional[str]): Directorio para la caché en disco (None la desactiva)
+        tamano_maximo_disco (int): Tamaño máximo en bytes de la caché en disco
+    """
+
+    ARCHIVO_VERSION = "VERSION"
+
+    def __init__(self, tamano_maximo: int = 32 * 1024 * 1024, directorio: Optional[str] = None,
+                 tamano_maximo_disco: int = 256 * 1024 * 1024):
+        self.tamano_maximo = tamano_maximo
+        self.directorio = directorio
+        self.tamano_maximo_disco = tamano_maximo_disco
+        self.version: Optional[str] = None
+        self._entradas = OrderedDict()
+        self._tamano_actual = 0
+        self._tamano_disco = 0
+        self.aciertos_memoria = 0
+        self.aciertos_disco = 0
+        self.fallos = 0
+        self.desalojos = 0
+        self.desalojos_disco = 0
+        if directorio:
+            if not os.path.exists(directorio):
+                os.makedirs(directorio)
+            self._tamano_disco = sum(tamano for _, _, tamano in self._archivos_disco())
+
+    @staticmethod
+    def generar_clave(operacion: str, texto: str, parametros: dict, huella: str = "") -> str:
+        """Construye la clave a partir del digest del texto, la operación y sus parámetros"""
+        digest = hashlib.blake2b(texto.encode("utf-8"), digest_size=16).hexdigest()
+        params = ",".join(f"{k}={parametros[k]!r}" for k in sorted(parametros))
+        firma = f"{operacion}|{params}|{huella}".encode("utf-8")
+        return f"{operacion}-{digest}-{hashlib.blake2b(firma, digest_size=8).hexdigest()}"
+
+    def _ruta_disco(self, clave: str) -> str:
+        return os.path.join(self.directorio, f"{clave}.pkl")
+
+    def _archivos_disco(self) -> List[tuple]:
+        """Lista (ruta, fecha de último uso, tamaño) de las entradas guardadas en disco"""
+        archivos = []
+        try:
+            with os.scandir(self.directorio) as entradas:
+                for entrada in entradas:
+                    if entrada.name.endswith(".pkl") and entrada.is_file():
+                        info = entrada.stat()
+                        archivos.append((entrada.path, info.st_mtime, info.st_size))
+        except OSError:
+            pass
+        return archivos
+
+    def _guardar_memoria(self, clave: str, datos: bytes) -> None:
+        if len(datos) > self.tamano_maximo:
+            return
+        if clave in self._entradas:
+            self._tamano_actual -= len(self._entradas.pop(clave))
+        self._entradas[clave] = datos
+        self._tamano_actual += len(datos)
+        while self._tamano_actual > self.tamano_maximo:
+            _, desalojado = self._entradas.popitem(last=False)
+            self._tamano_actual -= len(desalojado)
+            self.desalojos += 1
+
+    def _guardar_disco(self, clave: str, datos: bytes) -> None:
+        if len(datos) > self.tamano_maximo_disco:
+            return
+        ruta = self._ruta_disco(clave)
+        try:
+            if os.path.exists(ruta):
+                self._tamano_disco -= os.path.getsize(ruta)
+            with open(ruta, "wb") as archivo:
+                archivo.write(datos)
+            self._tamano_disco += len(datos)
+        except OSError:
+            return
+        if self._tamano_disco > self.tamano_maximo_disco:
+            self._podar_disco()
+
+    def _eliminar_disco(self, ruta: str) -> None:
+        try:
+            tamano = os.path.getsize(ruta)
+            os.remove(ruta)
+            self._tamano_disco -= tamano
+        except OSError:
+            pass
+
+    def _podar_disco(self) -> None:
+        """Elimina los archivos usados hace más tiempo hasta respetar el tamaño máximo en disco"""
+        archivos = sorted(self._archivos_disco(), key=lambda archivo: archivo[1])
+        self._tamano_disco = sum(tamano for _, _, tamano in archivos)
+        for ruta, _, tamano in archivos:
+            if self._tamano_disco <= self.tamano_maximo_disco:
+                break
+            try:
+                os.remove(ruta)
+                self._tamano_disco -= tamano
+                self.desalojos_disco += 1
+            except OSError:
+                pass
+
+    def obtener(self, clave: str, calcular: Callable[[], Any]) -> Any:
+        """Devuelve el valor almacenado para la clave o lo calcula y lo guarda"""
+        datos = self._entradas.get(clave)
+        if datos is not None:
+            self._entradas.move_to_end(clave)
+            self.aciertos_memoria += 1
+            return pickle.loads(datos)
+
+        if self.directorio:
+            ruta = self._ruta_disco(clave)
+            try:
+                with open(ruta, "rb") as archivo:
+                    datos = archivo.read()
+            except OSError:
+                datos = None
+            if datos is not None:
+                try:
+                    valor = pickle.loads(datos)
+                except Exception:
+                    # Archivo corrupto o generado con otras versiones de las bibliotecas
+                    self._eliminar_disco(ruta)
+                else:
+                    try:
+                        os.utime(ruta)
+                    except OSError:
+                        pass
+                    self._guardar_memoria(clave, datos)
+                    self.aciertos_disco += 1
+                    return valor
+
+        self.fallos += 1
+        valor = calcular()
+        capacidad = max(self.tamano_maximo, self.tamano_maximo_disco if self.directorio else 0)
+        if _estimar_tamano(valor) > capacidad:
+            return valor
+        datos = pickle.dumps(valor, protocol=pickle.HIGHEST_PROTOCOL)
+        self._guardar_memoria(clave, datos)
+        if self.directorio:
+            self._guardar_disco(clave, datos)
+        return valor
+
+    def establecer_version(self, version: str) -> None:
+        """
+        Invalida la caché cuando cambia la versión de los datos de entrada.
+
+        La versión se persiste junto a la caché en disco, de modo que los archivos
+        generados con una versión anterior se eliminan también entre ejecuciones.
+        """
+        if version == self.version:
+            return
+        if self.version is not None:
+            self.limpiar()
+        self.version = version
+        if not self.directorio:
+            return
+        ruta = os.path.join(self.directorio, self.ARCHIVO_VERSION)
+        try:
+            with open(ruta, "r", encoding="utf-8") as archivo:
+                version_disco = archivo.read().strip()
+        except OSError:
+            version_disco = None
+        if version_disco != version:
+            self.limpiar(incluir_disco=True)
+            try:
+                with open(ruta, "w", encoding="utf-8") as archivo:
+                    archivo.write(version)
+            except OSError:
+                pass
+
+    def limpiar(self, incluir_disco: bool = False) -> None:
+        """Vacía la caché en memoria y, opcionalmente, la de disco"""
+        self._entradas.clear()
+        self._tamano_actual = 0
+        if incluir_disco and self.directorio:
+            for ruta, _, _ in self._archivos_disco():
+                try:
+                    os.remove(ruta)
+                except OSError:
+                    pass
+            self._tamano_disco = sum(tamano for _, _, tamano in self._archivos_disco())
+
+    def estadisticas(self) -> dict:
+        """Devuelve las tasas de acierto y fallo junto con el uso de la caché"""
+        aciertos = self.aciertos_memoria + self.aciertos_disco
+        total = aciertos + self.fallos
+        return {
+            "entradas": len(self._entradas),
+            "tamano_bytes": self._tamano_actual,
+            "tamano_maximo": self.tamano_maximo,
+            "tamano_disco_bytes": self._tamano_disco,
+            "tamano_maximo_disco": self.tamano_maximo_disco,
+            "aciertos_memoria": self.aciertos_memoria,
+            "aciertos_disco": self.aciertos_disco,
+            "fallos": self.fallos,
+            "desalojos": self.desalojos,
+            "desalojos_disco": self.desalojos_disco,
+            "tasa_aciertos": aciertos / total if total else 0.0,
+            "tasa_fallos": self.fallos / total if total else 0.0
+        }
+
+_MENSAJE_VOCABULARIO_VACIO = "empty vocabulary; perhaps the documents only contain stop words"
+
+# Salto de línea precedido por ., ? o !: candidato a límite entre fragmentos. Basta un único
+# salto, como en el texto de leer_docx. sent_tokenize no siempre corta ahí (abreviaturas,
+# iniciales, números ordinales, puntos suspensivos), así que cada candidato se verifica.
+_PATRON_LIMITE_PARRAFO = re.compile(r'(?<=[.!?])[ \t]*\n\s*')
+
+# Contexto a cada lado de un candidato con el que se consulta a sent_tokenize. Las decisiones
+# de Punkt dependen sólo de los tokens vecinos al signo de puntuación.
+_VENTANA_VERIFICACION = 200
+
+def _es_limite_de_oracion(texto: str, posicion: int) -> bool:
+    """Comprueba con sent_tokenize que una oración termina justo antes de la posición indicada"""
+    inicio = max(0, posicion - _VENTANA_VERIFICACION)
+    ventana = texto[inicio:posicion + _VENTANA_VERIFICACION]
+    fin_anterior = len(texto[inicio:posicion].rstrip())
+    cursor = 0
+    for oracion in sent_tokenize(ventana):
+        comienzo = ventana.find(oracion, cursor)
+        if comienzo < 0:
+            return False
+        cursor = comienzo + len(oracion)
+        if cursor >= fin_anterior:
+            return cursor == fin_anterior
+    return False
+
+def dividir_en_fragmentos(texto: str, num_fragmentos: int) -> List[str]:
+    """
+    Divide el texto en fragmentos de tamaño similar, cortando sólo entre oraciones.
+
+    Un salto de línea tras ., ? o ! sólo se usa como corte si sent_tokenize termina una
+    oración exactamente ahí, de modo que tokenizar cada fragmento por separado produce
+    las mismas oraciones que tokenizar el texto completo.
+
+    Args:
+        texto (str): Texto a dividir
+        num_fragmentos (int): Número aproximado de fragmentos deseados
+
+    Returns:
+        List[str]: Fragmentos en el orden original del texto
+    """
+    if num_fragmentos <= 1:
+        return [texto]
+    tamano_objetivo = max(1, len(texto) // num_fragmentos)
+    fragmentos = []
+    inicio = 0
+    for limite in _PATRON_LIMITE_PARRAFO.finditer(texto):
+        if limite.end() - inicio >= tamano_objetivo and _es_limite_de_oracion(texto, limite.end()):
+            fragmentos.append(texto[inicio:limite.end()])
+            inicio = limite.end()
+    if inicio < len(texto):
+        fragmentos.append(texto[inicio:])
+    return fragmentos
+
+def _contar_oraciones_fragmento(fragmento: str, stop_words: List[str]) -> tuple:
+    """Tokeniza un fragmento en oraciones y cuenta sus términos (en un proceso hijo si hay varios)"""
+    oraciones = sent_tokenize(fragmento)
+    if not oraciones:
+        return oraciones, [], None
+    vectorizer = CountVectorizer(stop_words=stop_words, dtype=np.float64)
+    try:
+        conteos = vectorizer.fit_transform(oraciones)
+    except ValueError:
+        return oraciones, [], None
+    return oraciones, list(vectorizer.get_feature_names_out()), conteos
+
+def _contar_terminos_fragmento(fragmento: str, stop_words: List[str]) -> Counter:
+    """Cuenta los términos de un fragmento completo (en un proceso hijo si hay varios)"""
+    vectorizer = CountVectorizer(stop_words=stop_words)
+    try:
+        conteos = vectorizer.fit_transform([fragmento])
+    except ValueError:
+        return Counter()
+    return Counter(dict(zip(vectorizer.get_feature_names_out(), conteos.toarray()[0].tolist())))
+
+def _unir_conteos_oraciones(parciales: list) -> tuple:
+    """
+    Combina los conteos parciales de cada fragmento en una única matriz oración×término.
+
+    Si ningún fragmento aporta términos, el vocabulario queda vacío y la matriz sin columnas.
+    El vocabulario global se ordena alfabéticamente y los índices de cada fila se ordenan,
+    de modo que la matriz resultante (y las sumas en coma flotante calculadas sobre ella)
+    no dependen de cómo se dividió el texto. La ruta serial es el caso de un único fragmento.
+    """
+    vocabulario = sorted(set().union(*(terminos for _, terminos, _ in parciales)))
+    indice_global = {termino: i for i, termino in enumerate(vocabulario)}
+
+    oraciones = []
+    matrices = []
+    for oraciones_fragmento, terminos, conteos in parciales:
+        oraciones.extend(oraciones_fragmento)
+        if not oraciones_fragmento:
+            continue
+        if conteos is None:
+            matrices.append(csr_matrix((len(oraciones_fragmento), len(vocabulario)), dtype=np.float64))
+            continue
+        mapa = np.array([indice_global[t] for t in terminos], dtype=conteos.indices.dtype)
+        matriz = csr_matrix(
+            (conteos.data, mapa[conteos.indices], conteos.indptr),
+            shape=(conteos.shape[0], len(vocabulario))
+        )
+        matriz.sort_indices()
+        matrices.append(matriz)
+    if not matrices:
+        return oraciones, vocabulario, csr_matrix((0, len(vocabulario)), dtype=np.float64)
+    return oraciones, vocabulario, vstack(matrices, format="csr")
+
 class EstudioPersonalizado:
-    def __init__(self):
+    def __init__(self, tamano_cache: int = 32 * 1024 * 1024, directorio_cache: Optional[str] = None,
+                 num_procesos: int = 1, umbral_fragmentado: int = 500_000,
+                 tamano_cache_disco: int = 256 * 1024 * 1024):
         try:
             nltk.download('punkt', quiet=True)
             nltk.download('stopwords', quiet=True)
@@ -38,6 +385,47 @@ class EstudioPersonalizado:
             'nuestro', 'nuestros', 'o', 'para', 'pero', 'por', 'que', 'se', 'sin', 'su', 
             'sus', 'te', 'ti', 'tu', 'un', 'una', 'y', 'ya'
         ])
+        self.cache = CacheResultados(tamano_cache, directorio_cache, tamano_cache_disco)
+        self.num_procesos = num_procesos
+        self.umbral_fragmentado = umbral_fragmentado
+        self._huella_stop_words = self._calcular_huella_stop_words()
+        self.cache.establecer_version(f"{self._huella_stop_words};{_VERSION_BIBLIOTECAS}")
+
+    def _calcular_huella_stop_words(self) -> str:
+        contenido = "\n".join(self.stop_words).encode("utf-8")
+        return hashlib.blake2b(contenido, digest_size=8).hexdigest()
+
+    def _memorizar(self, operacion: str, texto: str, parametros: dict, calcular: Callable[[], Any]) -> Any:
+        """Obtiene el resultado desde la caché, invalidándola si cambiaron las stopwords"""
+        huella = self._calcular_huella_stop_words()
+        if huella != self._huella_stop_words:
+            self.cache.establecer_version(f"{huella};{_VERSION_BIBLIOTECAS}")
+            self._huella_stop_words = huella
+        clave = CacheResultados.generar_clave(operacion, texto, parametros, huella)
+        return self.cache.obtener(clave, calcular)
+
+    def estadisticas_cache(self) -> dict:
+        """Devuelve las estadísticas de aciertos y fallos de la caché de resultados"""
+        return self.cache.estadisticas()
+
+    def _fragmentar(self, texto: str) -> Optional[List[str]]:
+        """Devuelve los fragmentos a procesar en paralelo, o None si conviene la ruta serial"""
+        if self.num_procesos <= 1 or len(texto) < self.umbral_fragmentado:
+            return None
+        fragmentos = dividir_en_fragmentos(texto, self.num_procesos * 4)
+        return fragmentos if len(fragmentos) >= 2 else None
+
+    def _procesar_fragmentos(self, funcion: Callable, fragmentos: List[str]) -> list:
+        """Aplica la función a cada fragmento en procesos paralelos, conservando el orden"""
+        with ProcessPoolExecutor(max_workers=self.num_procesos) as pool:
+            return list(pool.map(funcion, fragmentos, [self.stop_words] * len(fragmentos)))
+
+    def _conteos_oraciones(self, texto: str) -> list:
+        """Tokeniza y cuenta los términos por oración, en paralelo si el texto lo justifica"""
+        fragmentos = self._fragmentar(texto)
+        if fragmentos:
+            return self._procesar_fragmentos(_contar_oraciones_fragmento, fragmentos)
+        return [_contar_oraciones_fragmento(texto, self.stop_words)]
 
     def validar_texto(self, texto: str) -> None:
         """Valida que el texto no esté vacío"""
@@ -47,37 +435,59 @@ class EstudioPersonalizado:
     def generar_resumen(self, texto: str, num_oraciones: int = 3) -> str:
         try:
             self.validar_texto(texto)
-            oraciones = sent_tokenize(texto)
-            
-            if len(oraciones) <= num_oraciones:
-                return texto
-            
-            tfidf_vectorizer = TfidfVectorizer(stop_words=self.stop_words)
-            tfidf_matrix = tfidf_vectorizer.fit_transform(oraciones)
-            scores = tfidf_matrix.sum(axis=1).A1
-            
-            oraciones_ordenadas = sorted(zip(oraciones, scores), key=lambda x: x[1], reverse=True)
-            resumen = [oracion for oracion, _ in oraciones_ordenadas[:num_oraciones]]
-            
-            return ' '.join(resumen)
+            return self._memorizar(
+                "resumen", texto, {"num_oraciones": num_oraciones},
+                lambda: self._calcular_resumen(texto, num_oraciones)
+            )
         except Exception as e:
             raise ProcesamientoError(f"Error al generar el resumen: {str(e)}")
+
+    def _calcular_resumen(self, texto: str, num_oraciones: int) -> str:
+        oraciones, vocabulario, tfidf_matrix = self._matriz_oraciones(texto)
+        
+        if len(oraciones) <= num_oraciones:
+            return texto
+        if not vocabulario:
+            raise ValueError(_MENSAJE_VOCABULARIO_VACIO)
+        
+        scores = tfidf_matrix.sum(axis=1).A1
+        
+        oraciones_ordenadas = sorted(zip(oraciones, scores), key=lambda x: x[1], reverse=True)
+        resumen = [oracion for oracion, _ in oraciones_ordenadas[:num_oraciones]]
+        
+        return ' '.join(resumen)
     
     def extraer_conceptos_clave(self, texto: str, num_conceptos: int = 5) -> List[str]:
         try:
             self.validar_texto(texto)
-            tfidf_vectorizer = TfidfVectorizer(stop_words=self.stop_words)
-            tfidf_matrix = tfidf_vectorizer.fit_transform([texto])
-            palabras = tfidf_vectorizer.get_feature_names_out()
-            scores = tfidf_matrix.sum(axis=0).A1
-            
-            conceptos = sorted(zip(palabras, scores), key=lambda x: x[1], reverse=True)
-            conceptos_filtrados = [concepto[0] for concepto in conceptos if len(concepto[0]) > 2]
-            
-            return conceptos_filtrados[:num_conceptos]
+            return self._memorizar(
+                "conceptos", texto, {"num_conceptos": num_conceptos},
+                lambda: self._calcular_conceptos_clave(texto, num_conceptos)
+            )
         except Exception as e:
             raise ProcesamientoError(f"Error al extraer conceptos clave: {str(e)}")
 
+    def _calcular_conceptos_clave(self, texto: str, num_conceptos: int) -> List[str]:
+        fragmentos = self._fragmentar(texto)
+        if fragmentos:
+            parciales = self._procesar_fragmentos(_contar_terminos_fragmento, fragmentos)
+        else:
+            parciales = [_contar_terminos_fragmento(texto, self.stop_words)]
+        conteos = Counter()
+        for parcial in parciales:
+            conteos.update(parcial)
+        if not conteos:
+            raise ValueError(_MENSAJE_VOCABULARIO_VACIO)
+        palabras = sorted(conteos)
+        matriz = csr_matrix(np.array([[conteos[p] for p in palabras]], dtype=np.float64))
+        tfidf_matrix = TfidfTransformer().fit_transform(matriz)
+        scores = tfidf_matrix.sum(axis=0).A1
+        
+        conceptos = sorted(zip(palabras, scores), key=lambda x: x[1], reverse=True)
+        conceptos_filtrados = [concepto[0] for concepto in conceptos if len(concepto[0]) > 2]
+        
+        return conceptos_filtrados[:num_conceptos]
+
     def generar_preguntas(self, texto: str, num_preguntas: int = 5) -> List[str]:
         """
         Genera preguntas de estudio basadas en el texto proporcionado.
@@ -91,38 +501,105 @@ class EstudioPersonalizado:
         """
         try:
             self.validar_texto(texto)
+            return list(self._generar_preguntas_con_conceptos(texto, num_preguntas))
+        except Exception as e:
+            raise ProcesamientoError(f"Error al generar preguntas: {str(e)}")
+
+    def _generar_preguntas_con_conceptos(self, texto: str, num_preguntas: int) -> dict:
+        """Genera las preguntas junto con los conceptos usados en cada una"""
+        conceptos = self.extraer_conceptos_clave(texto, num_preguntas * 2)
+        
+        plantillas = [
+            "¿Cuál es la importancia de {} en el texto?",
+            "¿Qué relación existe entre {} y {}?",
+            "¿Cómo se define o caracteriza {} en el contexto?",
+            "¿Qué aspectos principales se mencionan sobre {}?",
+            "¿Cuáles son las implicaciones de {} en el tema tratado?",
+            "¿Por qué es relevante {} para la comprensión del texto?",
+            "¿Qué ejemplos se presentan relacionados con {}?"
+        ]
+        
+        preguntas = {}
+        while len(preguntas) < num_preguntas and conceptos:
+            plantilla = random.choice(plantillas)
             
-            oraciones = sent_tokenize(texto)
-            conceptos = self.extraer_conceptos_clave(texto, num_preguntas * 2)
+            if "{}" in plantilla:
+                if plantilla.count("{}") == 2 and len(conceptos) >= 2:
+                    concepto1 = conceptos.pop(0)
+                    concepto2 = conceptos.pop(0)
+                    pregunta = plantilla.format(concepto1, concepto2)
+                    preguntas[pregunta] = [concepto1, concepto2]
+                else:
+                    concepto = conceptos.pop(0)
+                    pregunta = plantilla.format(concepto)
+                    preguntas[pregunta] = [concepto]
+        
+        return preguntas
+
+    def generar_preguntas_con_respuestas(self, texto: str, num_preguntas: int = 5,
+                                         num_respuestas: int = 2) -> List[dict]:
+        """
+        Genera preguntas de estudio y adjunta a cada una las oraciones del texto que la respaldan.
+
+        Las oraciones se puntúan para todas las preguntas a la vez con un único producto
+        de matrices dispersas entre los conceptos de cada pregunta y la matriz TF-IDF
+        oración×término, y se conservan las num_respuestas de mayor puntuación.
+        
+        Args:
+            texto (str): Texto del cual generar preguntas
+            num_preguntas (int): Número de preguntas a generar (default: 5)
+            num_respuestas (int): Oraciones de respaldo por pregunta (default: 2)
             
-            plantillas = [
-                "¿Cuál es la importancia de {} en el texto?",
-                "¿Qué relación existe entre {} y {}?",
-                "¿Cómo se define o caracteriza {} en el contexto?",
-                "¿Qué aspectos principales se mencionan sobre {}?",
-                "¿Cuáles son las implicaciones de {} en el tema tratado?",
-                "¿Por qué es relevante {} para la comprensión del texto?",
-                "¿Qué ejemplos se presentan relacionados con {}?"
+        Returns:
+            List[dict]: Una entrada por pregunta con sus claves "pregunta", "conceptos" y "respuestas"
+        """
+        try:
+            self.validar_texto(texto)
+            preguntas = self._generar_preguntas_con_conceptos(texto, num_preguntas)
+            if not preguntas:
+                return []
+
+            oraciones, vocabulario, tfidf_matrix = self._matriz_oraciones(texto)
+            indice = {termino: i for i, termino in enumerate(vocabulario)}
+
+            filas, columnas = [], []
+            for fila, conceptos in enumerate(preguntas.values()):
+                for concepto in conceptos:
+                    if concepto in indice:
+                        filas.append(fila)
+                        columnas.append(indice[concepto])
+            consultas = csr_matrix(
+                (np.ones(len(filas)), (filas, columnas)),
+                shape=(len(preguntas), len(vocabulario))
+            )
+
+            puntuaciones = (consultas @ tfidf_matrix.T).tocoo()
+            orden = np.lexsort((puntuaciones.col, -puntuaciones.data, puntuaciones.row))
+            filas_ordenadas = puntuaciones.row[orden]
+            columnas_ordenadas = puntuaciones.col[orden]
+            rango = np.arange(len(orden)) - np.searchsorted(filas_ordenadas, filas_ordenadas)
+            seleccion = rango < num_respuestas
+
+            respuestas = [[] for _ in preguntas]
+            for fila, columna in zip(filas_ordenadas[seleccion], columnas_ordenadas[seleccion]):
+                respuestas[fila].append(oraciones[columna])
+
+            return [
+                {"pregunta": pregunta, "conceptos": conceptos, "respuestas": respuestas[i]}
+                for i, (pregunta, conceptos) in enumerate(preguntas.items())
             ]
-            
-            preguntas = set()
-            while len(preguntas) < num_preguntas and conceptos:
-                plantilla = random.choice(plantillas)
-                
-                if "{}" in plantilla:
-                    if plantilla.count("{}") == 2 and len(conceptos) >= 2:
-                        concepto1 = conceptos.pop(0)
-                        concepto2 = conceptos.pop(0)
-                        pregunta = plantilla.format(concepto1, concepto2)
-                    else:
-                        concepto = conceptos.pop(0)
-                        pregunta = plantilla.format(concepto)
-                    
-                    preguntas.add(pregunta)
-            
-            return list(preguntas)
         except Exception as e:
-            raise ProcesamientoError(f"Error al generar preguntas: {str(e)}")
+            raise ProcesamientoError(f"Error al generar preguntas con respuestas: {str(e)}")
+
+    def _matriz_oraciones(self, texto: str) -> tuple:
+        """Devuelve las oraciones, el vocabulario y la matriz TF-IDF oración×término del texto"""
+        return self._memorizar("matriz_oraciones", texto, {}, lambda: self._calcular_matriz_oraciones(texto))
+
+    def _calcular_matriz_oraciones(self, texto: str) -> tuple:
+        oraciones, vocabulario, conteos = _unir_conteos_oraciones(self._conteos_oraciones(texto))
+        if not vocabulario:
+            return oraciones, vocabulario, conteos
+        return oraciones, vocabulario, TfidfTransformer().fit_transform(conteos)
 
     def extraer_metadatos(self, texto: str) -> dict:
         """Extrae metadatos básicos del texto"""
@@ -269,32 +746,170 @@ Notas adicionales: No especificadas"""
         except Exception as e:
             raise ProcesamientoError(f"Error al crear ficha resumen: {str(e)}")
 
+    def crear_ficha_preguntas(self, texto: str) -> Optional[Ficha]:
+        try:
+            metadatos = self.extraer_metadatos(texto)
+            preguntas = self.generar_preguntas_con_respuestas(texto)
+            contenido = f"""
+Título: {metadatos['titulo']}
+Palabras clave: {', '.join(metadatos['palabras_clave'])}
+Preguntas con respuestas:
+{formatear_preguntas_con_respuestas(preguntas)}"""
+            
+            ficha = self.Ficha("Preguntas con respuestas", contenido, metadatos)
+            self.fichas.append(ficha)
+            return ficha
+        except Exception as e:
+            raise ProcesamientoError(f"Error al crear ficha de preguntas: {str(e)}")
+
     def extraer_titulo(self, texto: str) -> str:
         try:
             self.validar_texto(texto)
-            oraciones = sent_tokenize(texto)
-            if oraciones:
-                titulo = oraciones[0].strip()
-                return titulo[:100] if len(titulo) > 100 else titulo
-            return "Título no disponible"
+            return self._memorizar("titulo", texto, {}, lambda: self._calcular_titulo(texto))
         except Exception as e:
             raise ProcesamientoError(f"Error al extraer título: {str(e)}")
 
-def leer_pdf(archivo_pdf: str) -> str:
+    def _calcular_titulo(self, texto: str) -> str:
+        oraciones = sent_tokenize(texto)
+        if oraciones:
+            titulo = oraciones[0].strip()
+            return titulo[:100] if len(titulo) > 100 else titulo
+        return "Título no disponible"
+
+_PATRON_NUMERO_PAGINA = re.compile(
+    r'^\W*(?:p[áa]g(?:ina)?\.?\s*)?\d+(?:\s*(?:de|/)\s*\d+)?\W*$', re.IGNORECASE
+)
+_PATRON_DIGITOS = re.compile(r'\d+')
+_PATRON_ESPACIOS = re.compile(r'\s+')
+_PATRON_GUION_FINAL = re.compile(r'(?<=[^\W\d_])-\n[ \t]*(?=[a-záéíóúüñ])')
+_PATRON_ESPACIOS_HORIZONTALES = re.compile(r'[ \t\f\v]+')
+_PATRON_LINEAS_VACIAS = re.compile(r'\n{3,}')
+
+def _clave_linea(linea: str) -> str:
+    """Normaliza una línea para compararla entre páginas; sólo en numeraciones se ignoran los dígitos"""
+    linea = linea.strip()
+    if _PATRON_NUMERO_PAGINA.match(linea):
+        linea = _PATRON_DIGITOS.sub('#', linea)
+    return _PATRON_ESPACIOS.sub(' ', linea).lower()
+
+def _lineas_no_vacias(lineas: List[str]) -> List[int]:
+    return [i for i, linea in enumerate(lineas) if linea.strip()]
+
+def _indices_zona(no_vacias: List[int], lineas_zona: int) -> List[int]:
+    """Índices de las primeras y últimas líneas no vacías, o ninguno si la página es corta"""
+    if len(no_vacias) <= 2 * lineas_zona:
+        return []
+    return no_vacias[:lineas_zona] + no_vacias[-lineas_zona:]
+
+def _es_numero_de_pagina(linea: str, numero_pagina: int) -> bool:
+    """Indica si la línea es sólo el número de la página en la que aparece (p. ej. "Pág. 3 de 10")"""
+    if not _PATRON_NUMERO_PAGINA.match(linea):
+        return False
+    return int(_PATRON_DIGITOS.search(linea).group()) == numero_pagina
+
+def normalizar_paginas(paginas: List[str], lineas_zona: int = 3, umbral_repeticion: float = 0.5) -> dict:
+    """
+    Elimina encabezados, pies y números de página repetidos y une palabras cortadas con guión.
+
+    Sólo se analizan las primeras y últimas líneas de las páginas con más de 2 * lineas_zona
+    líneas no vacías; en páginas más cortas esas zonas abarcarían el cuerpo. Una línea se
+    considera repetitiva si su texto normalizado aparece en al menos la proporción indicada
+    de páginas (en las numeraciones se ignoran los dígitos). Además se elimina la primera o
+    la última línea de una página cuando contiene únicamente el número de esa página.
+
+    Args:
+        paginas (List[str]): Texto extraído de cada página
+        lineas_zona (int): Líneas del inicio y del final de cada página a revisar
+        umbral_repeticion (float): Proporción mínima de páginas en que debe repetirse una línea
+
+    Returns:
+        dict: Texto limpio y estadísticas de lo eliminado
+    """
+    lineas_por_pagina = [pagina.splitlines() for pagina in paginas]
+    no_vacias_por_pagina = [_lineas_no_vacias(lineas) for lineas in lineas_por_pagina]
+    zonas = [_indices_zona(no_vacias, lineas_zona) for no_vacias in no_vacias_por_pagina]
+    repeticiones = Counter()
+    for lineas, indices in zip(lineas_por_pagina, zonas):
+        repeticiones.update({_clave_linea(lineas[i]) for i in indices})
+
+    minimo_paginas = max(2, int(umbral_repeticion * len(paginas) + 0.5))
+    repetidas = set()
+    if len(paginas) >= 3:
+        repetidas = {clave for clave, veces in repeticiones.items() if veces >= minimo_paginas}
+
+    lineas_eliminadas = 0
+    paginas_limpias = []
+    for numero_pagina, (lineas, no_vacias, indices) in enumerate(
+            zip(lineas_por_pagina, no_vacias_por_pagina, zonas), 1):
+        descartar = {i for i in indices if _clave_linea(lineas[i]) in repetidas}
+        for i in {no_vacias[0], no_vacias[-1]} if no_vacias else ():
+            if _es_numero_de_pagina(lineas[i].strip(), numero_pagina):
+                descartar.add(i)
+        lineas_eliminadas += len(descartar)
+        paginas_limpias.append("\n".join(
+            linea.strip() for i, linea in enumerate(lineas) if i not in descartar
+        ))
+
+    texto = "\n".join(paginas_limpias)
+    texto, palabras_unidas = _PATRON_GUION_FINAL.subn('', texto)
+    texto = _PATRON_ESPACIOS_HORIZONTALES.sub(' ', texto)
+    texto = _PATRON_LINEAS_VACIAS.sub('\n\n', texto).strip()
+
+    caracteres_originales = sum(len(pagina) for pagina in paginas)
+    caracteres_eliminados = max(0, caracteres_originales - len(texto))
+    return {
+        "texto": texto,
+        "caracteres_originales": caracteres_originales,
+        "caracteres_eliminados": caracteres_eliminados,
+        "porcentaje_eliminado": 100 * caracteres_eliminados / caracteres_originales if caracteres_originales else 0.0,
+        "lineas_eliminadas": lineas_eliminadas,
+        "palabras_unidas": palabras_unidas
+    }
+
+def extraer_paginas_pdf(archivo_pdf: str) -> List[str]:
+    """Extrae el texto de cada página del PDF sin procesar"""
     try:
-        texto = ""
         with open(archivo_pdf, "rb") as file:
             lector_pdf = PyPDF2.PdfReader(file)
-            for pagina in lector_pdf.pages:
-                texto += pagina.extract_text() or ""
-        if not texto.strip():
+            paginas = [pagina.extract_text() or "" for pagina in lector_pdf.pages]
+        if not any(pagina.strip() for pagina in paginas):
             raise DocumentoVacioError("El archivo PDF está vacío o no contiene texto extraíble")
-        return texto
+        return paginas
     except DocumentoVacioError:
         raise
     except Exception as e:
         raise EstudioError(f"Error al leer el archivo PDF: {str(e)}")
 
+def leer_pdf_con_reporte(archivo_pdf: str) -> dict:
+    """Lee y normaliza el PDF; devuelve el reporte de normalizar_paginas con el texto limpio"""
+    reporte = normalizar_paginas(extraer_paginas_pdf(archivo_pdf))
+    if not reporte["texto"]:
+        raise DocumentoVacioError("El archivo PDF no contiene texto tras eliminar encabezados y pies de página")
+    return reporte
+
+def leer_pdf(archivo_pdf: str, normalizar: bool = True) -> str:
+    if not normalizar:
+        return "".join(extraer_paginas_pdf(archivo_pdf))
+    return leer_pdf_con_reporte(archivo_pdf)["texto"]
+
+def formatear_preguntas_con_respuestas(preguntas: List[dict]) -> str:
+    """Da formato de texto a la salida de generar_preguntas_con_respuestas"""
+    bloques = []
+    for i, entrada in enumerate(preguntas, 1):
+        lineas = [f"{i}. {entrada['pregunta']}"]
+        if entrada["respuestas"]:
+            lineas.extend(f"   → {respuesta}" for respuesta in entrada["respuestas"])
+        else:
+            lineas.append("   → Sin oraciones de respaldo en el texto")
+        bloques.append("\n".join(lineas))
+    return "\n\n".join(bloques)
+
+def describir_normalizacion(reporte: dict) -> str:
+    """Genera un mensaje breve con lo eliminado por normalizar_paginas"""
+    return (f"Limpieza del PDF: {reporte['caracteres_eliminados']} caracteres eliminados "
+            f"({reporte['porcentaje_eliminado']:.1f}%), {reporte['lineas_eliminadas']} líneas "
+            f"de encabezado/pie, {reporte['palabras_unidas']} palabras unidas")
+
 def leer_docx(archivo_docx: str) -> str:
     try:
         texto = ""
@@ -309,9 +924,12 @@ def leer_docx(archivo_docx: str) -> str:
     except Exception as e:
         raise EstudioError(f"Error al leer el archivo DOCX: {str(e)}")
 
+DIRECTORIO_SALIDA = "fichas_generadas"
+DIRECTORIO_CACHE = os.path.join(DIRECTORIO_SALIDA, ".cache")
+
 def guardar_en_archivo(nombre_archivo: str, contenido: str) -> None:
     try:
-        directorio = "fichas_generadas"
+        directorio = DIRECTORIO_SALIDA
         if not os.path.exists(directorio):
             os.makedirs(directorio)
             
@@ -324,7 +942,10 @@ def guardar_en_archivo(nombre_archivo: str, contenido: str) -> None:
 
 def interfaz_usuario():
     try:
-        estudio = EstudioPersonalizado()
+        estudio = EstudioPersonalizado(
+            directorio_cache=DIRECTORIO_CACHE,
+            num_procesos=os.cpu_count() or 1
+        )
         
         print("\n=== Sistema de Estudio Personalizado ===")
         print("Ingrese la ruta del archivo (PDF o DOCX):")
@@ -335,7 +956,9 @@ def interfaz_usuario():
 
         extension = os.path.splitext(ruta_archivo)[1].lower()
         if extension == '.pdf':
-            texto = leer_pdf(ruta_archivo)
+            reporte = leer_pdf_con_reporte(ruta_archivo)
+            texto = reporte["texto"]
+            print(f"✓ {describir_normalizacion(reporte)}")
         elif extension == '.docx':
             texto = leer_docx(ruta_archivo)
         else:
@@ -346,7 +969,8 @@ def interfaz_usuario():
         print("2. Extraer conceptos clave")
         print("3. Generar preguntas de estudio")
         print("4. Crear fichas de estudio")
-        print("\nSeleccione una opción (1-4):")
+        print("5. Generar preguntas con respuestas")
+        print("\nSeleccione una opción (1-5):")
         
         eleccion = input().strip()
 
@@ -377,7 +1001,8 @@ def interfaz_usuario():
                 "bibliografica": estudio.crear_ficha_bibliografica,
                 "catalografica": estudio.crear_ficha_catalografica,
                 "textual": estudio.crear_ficha_textual,
-                "resumen": estudio.crear_ficha_resumen
+                "resumen": estudio.crear_ficha_resumen,
+                "preguntas": estudio.crear_ficha_preguntas
             }
             
             for tipo, funcion in tipos_fichas.items():
@@ -391,8 +1016,15 @@ def interfaz_usuario():
                     continue
             
             print("\n✓ Proceso de generación de fichas completado")
+        
+        elif eleccion == "5":
+            preguntas = estudio.generar_preguntas_con_respuestas(texto)
+            contenido = formatear_preguntas_con_respuestas(preguntas)
+            print("\n=== Preguntas con respuestas ===")
+            print(contenido)
+            guardar_en_archivo("preguntas_con_respuestas.txt", contenido)
         else:
-            print("\n⚠ Opción no válida. Por favor, seleccione una opción del 1 al 4.")
+            print("\n⚠ Opción no válida. Por favor, seleccione una opción del 1 al 5.")
 
     except FileNotFoundError as e:
         print(f"\n❌ Error: {str(e)}")
@@ -3,10 +3,12 @@ from tkinter import ttk, filedialog, messagebox, scrolledtext
 from proyecto.app import (
     EstudioPersonalizado, 
     leer_docx, 
-    leer_pdf, 
+    leer_pdf_con_reporte,
+    describir_normalizacion,
     EstudioError, 
     DocumentoVacioError,
-    ProcesamientoError
+    ProcesamientoError,
+    formatear_preguntas_con_respuestas
 )
 import os
 from datetime import datetime
@@ -14,7 +16,7 @@ from typing import Optional
 
 class InterfazEstudio:
     def __init__(self):
-        self.estudio = EstudioPersonalizado()
+        self.estudio = EstudioPersonalizado(num_procesos=os.cpu_count() or 1)
         self.archivo_actual: Optional[str] = None
         self.setup_ui()
         
@@ -118,12 +120,20 @@ class InterfazEstudio:
         
         preguntas_frame = ttk.Frame(self.notebook)
         self.notebook.add(preguntas_frame, text="Preguntas")
+        preguntas_botones = ttk.Frame(preguntas_frame)
+        preguntas_botones.grid(row=0, column=0, pady=5)
         ttk.Button(
-            preguntas_frame,
+            preguntas_botones,
             text="Generar Preguntas",
             command=self.mostrar_preguntas,
             style="Action.TButton"
-        ).grid(row=0, column=0, pady=5)
+        ).grid(row=0, column=0, padx=5)
+        ttk.Button(
+            preguntas_botones,
+            text="Preguntas con Respuestas",
+            command=self.mostrar_preguntas_con_respuestas,
+            style="Action.TButton"
+        ).grid(row=0, column=1, padx=5)
         self.preguntas_area = self.crear_area_texto(preguntas_frame, 1)
         
         fichas_frame = ttk.Frame(self.notebook)
@@ -139,7 +149,8 @@ class InterfazEstudio:
             ("Bibliográfica", "bibliografica"),
             ("Catalográfica", "catalografica"),
             ("Textual", "textual"),
-            ("Resumen", "resumen")
+            ("Resumen", "resumen"),
+            ("Preguntas", "preguntas")
         ]):
             ttk.Radiobutton(
                 tipos_frame,
@@ -186,8 +197,11 @@ class InterfazEstudio:
             self.status_var.set(f"Cargando archivo: {os.path.basename(archivo)}...")
             self.root.update()
             
+            mensaje = f"Archivo cargado: {os.path.basename(archivo)}"
             if extension == '.pdf':
-                texto = leer_pdf(archivo)
+                reporte = leer_pdf_con_reporte(archivo)
+                texto = reporte["texto"]
+                mensaje += f" — {describir_normalizacion(reporte)}"
             elif extension == '.docx':
                 texto = leer_docx(archivo)
             else:
@@ -195,7 +209,7 @@ class InterfazEstudio:
                 
             self.text_area.delete(1.0, tk.END)
             self.text_area.insert(tk.END, texto)
-            self.status_var.set(f"Archivo cargado: {os.path.basename(archivo)}")
+            self.status_var.set(mensaje)
             
         except DocumentoVacioError as e:
             messagebox.showerror("Error", f"El documento está vacío: {str(e)}")
@@ -277,6 +291,24 @@ class InterfazEstudio:
             messagebox.showerror("Error", f"Error al generar preguntas: {str(e)}")
             self.status_var.set("Error al generar preguntas")
             
+    def mostrar_preguntas_con_respuestas(self):
+        """Genera preguntas de estudio con sus oraciones de respaldo"""
+        try:
+            texto = self.obtener_texto()
+            self.status_var.set("Generando preguntas con respuestas...")
+            self.root.update()
+            
+            preguntas = self.estudio.generar_preguntas_con_respuestas(texto)
+            self.preguntas_area.delete(1.0, tk.END)
+            self.preguntas_area.insert(tk.END, formatear_preguntas_con_respuestas(preguntas))
+                
+            self.status_var.set("Preguntas con respuestas generadas exitosamente")
+            self.notebook.select(2) 
+            
+        except Exception as e:
+            messagebox.showerror("Error", f"Error al generar preguntas: {str(e)}")
+            self.status_var.set("Error al generar preguntas")
+            
     def mostrar_ficha(self):
         """Genera y muestra la ficha seleccionada"""
         try:
@@ -291,7 +323,8 @@ class InterfazEstudio:
                 "bibliografica": self.estudio.crear_ficha_bibliografica,
                 "catalografica": self.estudio.crear_ficha_catalografica,
                 "textual": self.estudio.crear_ficha_textual,
-                "resumen": self.estudio.crear_ficha_resumen
+                "resumen": self.estudio.crear_ficha_resumen,
+                "preguntas": self.estudio.crear_ficha_preguntas
             }
             
             ficha = metodos_ficha[tipo](texto)
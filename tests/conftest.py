@@ -0,0 +1,28 @@
+from types import SimpleNamespace
+
+import pytest
+from nltk.tokenize.punkt import PunktParameters, PunktSentenceTokenizer
+
+import proyecto.app as app
+
+
+def _crear_punkt():
+    """Punkt real sin los modelos descargables de NLTK, con algunas abreviaturas del español"""
+    parametros = PunktParameters()
+    parametros.abbrev_types = {"dr", "dra", "sr", "sra", "ud", "etc", "pág"}
+    return PunktSentenceTokenizer(parametros)
+
+
+@pytest.fixture(autouse=True)
+def punkt(monkeypatch):
+    tokenizador = _crear_punkt()
+    monkeypatch.setattr(app, "sent_tokenize", tokenizador.tokenize)
+    return tokenizador
+
+
+@pytest.fixture
+def estudio_factory(monkeypatch):
+    """Crea instancias de EstudioPersonalizado sin depender de los datos descargables de NLTK"""
+    monkeypatch.setattr(app.nltk, "download", lambda *args, **kwargs: True)
+    monkeypatch.setattr(app, "stopwords", SimpleNamespace(words=lambda idioma: ["de", "la", "el"]))
+    return app.EstudioPersonalizado
@@ -0,0 +1,139 @@
+import os
+
+from proyecto.app import CacheResultados
+
+
+def test_aciertos_y_fallos():
+    cache = CacheResultados()
+    clave = CacheResultados.generar_clave("conceptos", "texto", {"num_conceptos": 5})
+    llamadas = []
+
+    def calcular():
+        llamadas.append(1)
+        return ["a", "b"]
+
+    assert cache.obtener(clave, calcular) == ["a", "b"]
+    assert cache.obtener(clave, calcular) == ["a", "b"]
+    assert len(llamadas) == 1
+
+    estadisticas = cache.estadisticas()
+    assert estadisticas["fallos"] == 1
+    assert estadisticas["aciertos_memoria"] == 1
+    assert estadisticas["tasa_aciertos"] == 0.5
+
+
+def test_valores_devueltos_no_comparten_estado():
+    cache = CacheResultados()
+    clave = CacheResultados.generar_clave("conceptos", "texto", {})
+    cache.obtener(clave, lambda: ["a", "b"]).pop()
+    assert cache.obtener(clave, lambda: []) == ["a", "b"]
+
+
+def test_claves_distinguen_parametros():
+    clave3 = CacheResultados.generar_clave("resumen", "texto", {"num_oraciones": 3})
+    clave1 = CacheResultados.generar_clave("resumen", "texto", {"num_oraciones": 1})
+    assert clave3 != clave1
+
+
+def test_desalojo_lru_en_memoria():
+    cache = CacheResultados(tamano_maximo=250)
+    claves = [CacheResultados.generar_clave("op", str(i), {}) for i in range(3)]
+    for clave in claves:
+        cache.obtener(clave, lambda: "x" * 60)
+    cache.obtener(claves[0], lambda: "nuevo")
+    cache.obtener(CacheResultados.generar_clave("op", "3", {}), lambda: "x" * 60)
+
+    assert cache.estadisticas()["desalojos"] >= 1
+    assert cache.obtener(claves[0], lambda: "recalculado") == "x" * 60
+    assert cache.obtener(claves[1], lambda: "recalculado") == "recalculado"
+
+
+def test_nivel_disco_entre_instancias(tmp_path):
+    clave = CacheResultados.generar_clave("titulo", "texto", {})
+    CacheResultados(directorio=str(tmp_path)).obtener(clave, lambda: "Título")
+
+    cache = CacheResultados(directorio=str(tmp_path))
+    assert cache.obtener(clave, lambda: "recalculado") == "Título"
+    assert cache.estadisticas()["aciertos_disco"] == 1
+
+
+def test_poda_disco_elimina_los_mas_antiguos(tmp_path):
+    cache = CacheResultados(directorio=str(tmp_path), tamano_maximo_disco=300)
+    claves = [CacheResultados.generar_clave("op", str(i), {}) for i in range(3)]
+    for i, clave in enumerate(claves):
+        cache.obtener(clave, lambda: "x" * 100)
+        os.utime(cache._ruta_disco(clave), (1000 + i, 1000 + i))
+    cache.obtener(CacheResultados.generar_clave("op", "3", {}), lambda: "x" * 100)
+
+    assert not os.path.exists(cache._ruta_disco(claves[0]))
+    assert os.path.exists(cache._ruta_disco(claves[2]))
+    assert cache.estadisticas()["tamano_disco_bytes"] <= 300
+    assert cache.estadisticas()["desalojos_disco"] >= 1
+
+
+def test_cambio_de_version_invalida_disco(tmp_path):
+    clave = CacheResultados.generar_clave("titulo", "texto", {})
+    cache = CacheResultados(directorio=str(tmp_path))
+    cache.establecer_version("v1")
+    cache.obtener(clave, lambda: "Título")
+
+    nueva = CacheResultados(directorio=str(tmp_path))
+    nueva.establecer_version("v2")
+    assert not any(nombre.endswith(".pkl") for nombre in os.listdir(tmp_path))
+    assert nueva.obtener(clave, lambda: "recalculado") == "recalculado"
+
+
+def test_cambio_de_stopwords_invalida_cache(estudio_factory, tmp_path):
+    estudio = estudio_factory(directorio_cache=str(tmp_path))
+    texto = "La célula es la unidad básica. El núcleo contiene ADN."
+    estudio.extraer_conceptos_clave(texto)
+    estudio.extraer_conceptos_clave(texto)
+    assert estudio.estadisticas_cache()["aciertos_memoria"] == 1
+
+    estudio.stop_words.append("célula")
+    assert "célula" not in estudio.extraer_conceptos_clave(texto)
+    assert estudio.estadisticas_cache()["entradas"] == 1
+    assert len([nombre for nombre in os.listdir(tmp_path) if nombre.endswith(".pkl")]) == 1
+
+
+def test_no_serializa_valores_que_no_caben(monkeypatch):
+    import proyecto.app as app
+
+    llamadas = []
+    dumps_original = app.pickle.dumps
+
+    def dumps_contado(*args, **kwargs):
+        llamadas.append(1)
+        return dumps_original(*args, **kwargs)
+
+    monkeypatch.setattr(app.pickle, "dumps", dumps_contado)
+    cache = CacheResultados(tamano_maximo=100)
+
+    grande = ["x" * 80, "y" * 80]
+    assert cache.obtener(CacheResultados.generar_clave("op", "grande", {}), lambda: grande) == grande
+    assert llamadas == []
+
+    cache.obtener(CacheResultados.generar_clave("op", "pequeno", {}), lambda: "x")
+    assert llamadas == [1]
+
+
+def test_archivo_incompatible_en_disco_es_un_fallo(tmp_path):
+    cache = CacheResultados(directorio=str(tmp_path))
+    claves = [CacheResultados.generar_clave("op", str(i), {}) for i in range(2)]
+    # Referencia a un atributo inexistente: AttributeError al deserializar
+    with open(cache._ruta_disco(claves[0]), "wb") as archivo:
+        archivo.write(b"cnumpy\nno_existe_en_esta_version\n.")
+    with open(cache._ruta_disco(claves[1]), "wb") as archivo:
+        archivo.write(b"basura")
+
+    for clave in claves:
+        assert cache.obtener(clave, lambda: "recalculado") == "recalculado"
+    assert cache.estadisticas()["fallos"] == 2
+    assert cache.obtener(claves[0], lambda: "otra vez") == "recalculado"
+
+
+def test_version_incluye_bibliotecas(estudio_factory):
+    import sklearn
+
+    estudio = estudio_factory()
+    assert f"scikit-learn={sklearn.__version__}" in estudio.cache.version
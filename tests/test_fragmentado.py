@@ -0,0 +1,141 @@
+import multiprocessing
+import random
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+import proyecto.app as app
+from proyecto.app import dividir_en_fragmentos
+
+
+@pytest.fixture
+def texto_largo():
+    random.seed(7)
+    palabras = [f"termino{i}" for i in range(400)] + ["de", "la", "el"]
+    parrafos = []
+    for i in range(60):
+        oraciones = [
+            " ".join(random.choices(palabras, k=random.randint(4, 12))).capitalize() + "."
+            for _ in range(random.randint(1, 4))
+        ]
+        parrafos.append(f"Capítulo {i}:\n\n" + " ".join(oraciones))
+    return "\n\n".join(parrafos)
+
+
+@pytest.fixture
+def estudios(estudio_factory, monkeypatch):
+    # Los hilos comparten los parches del tokenizador; el cálculo es el mismo que en procesos.
+    monkeypatch.setattr(app, "ProcessPoolExecutor", ThreadPoolExecutor)
+    serial = estudio_factory()
+    fragmentado = estudio_factory(num_procesos=4, umbral_fragmentado=0)
+    return serial, fragmentado
+
+
+@pytest.fixture
+def texto_con_abreviaturas():
+    random.seed(11)
+    palabras = [f"termino{i}" for i in range(300)]
+    trampas = [
+        "firmó el Dr.\nGarcía ayer el acta",
+        "se revisó el punto 3.\nluego se discute",
+        "vino J.\nPérez al acto",
+        "y entonces...\nluego se fue",
+    ]
+    lineas = []
+    for i in range(400):
+        oracion = " ".join(random.choices(palabras, k=random.randint(4, 10))).capitalize()
+        if i % 3 == 0:
+            oracion += " " + trampas[i % len(trampas)]
+        lineas.append(oracion + ".")
+    return "\n".join(lineas)
+
+
+def _assert_mismos_resultados(serial, fragmentado, texto):
+    assert fragmentado._fragmentar(texto)
+    assert serial._calcular_resumen(texto, 40) == fragmentado._calcular_resumen(texto, 40)
+    assert serial._calcular_conceptos_clave(texto, 30) == fragmentado._calcular_conceptos_clave(texto, 30)
+
+    oraciones_s, vocabulario_s, matriz_s = serial._calcular_matriz_oraciones(texto)
+    oraciones_f, vocabulario_f, matriz_f = fragmentado._calcular_matriz_oraciones(texto)
+    assert oraciones_s == oraciones_f
+    assert list(vocabulario_s) == list(vocabulario_f)
+    assert matriz_s.shape == matriz_f.shape
+    assert (matriz_s != matriz_f).nnz == 0
+
+
+def test_fragmentos_reconstruyen_el_texto(texto_largo):
+    fragmentos = dividir_en_fragmentos(texto_largo, 16)
+    assert len(fragmentos) > 1
+    assert "".join(fragmentos) == texto_largo
+
+
+def test_no_corta_tras_dos_puntos():
+    texto = "Capítulo 3:\n\nEl modelo se describe aquí.\n\nOtro párrafo final."
+    for fragmento in dividir_en_fragmentos(texto, 10):
+        assert not fragmento.rstrip().endswith(":")
+
+
+def test_corta_en_saltos_simples_de_linea():
+    texto = "\n".join(f"Párrafo número {i} del documento." for i in range(100))
+    assert len(dividir_en_fragmentos(texto, 8)) > 1
+
+
+def test_resultados_identicos_a_ruta_serial(estudios, texto_largo):
+    serial, fragmentado = estudios
+    _assert_mismos_resultados(serial, fragmentado, texto_largo)
+
+
+def test_cortes_respetan_abreviaturas_de_punkt(punkt, texto_con_abreviaturas):
+    fragmentos = dividir_en_fragmentos(texto_con_abreviaturas, 32)
+    assert len(fragmentos) > 1
+    oraciones_serial = punkt.tokenize(texto_con_abreviaturas)
+    assert [o for fragmento in fragmentos for o in punkt.tokenize(fragmento)] == oraciones_serial
+    for fragmento in fragmentos[:-1]:
+        assert not fragmento.rstrip().endswith(("Dr.", "punto 3.", " J.", "..."))
+
+
+def test_resultados_identicos_con_abreviaturas(estudios, texto_con_abreviaturas):
+    serial, fragmentado = estudios
+    _assert_mismos_resultados(serial, fragmentado, texto_con_abreviaturas)
+
+
+@pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(),
+    reason="los procesos hijos deben heredar el tokenizador de prueba"
+)
+def test_resultados_identicos_con_procesos_reales(estudio_factory, monkeypatch, texto_con_abreviaturas):
+    monkeypatch.setattr(
+        app, "ProcessPoolExecutor",
+        partial(ProcessPoolExecutor, mp_context=multiprocessing.get_context("fork"))
+    )
+    serial = estudio_factory()
+    fragmentado = estudio_factory(num_procesos=2, umbral_fragmentado=0)
+    _assert_mismos_resultados(serial, fragmentado, texto_con_abreviaturas)
+
+
+def test_un_solo_fragmento_usa_ruta_serial(estudio_factory, monkeypatch):
+    def sin_procesos(*args, **kwargs):
+        raise AssertionError("no se debe crear un pool para un único fragmento")
+
+    monkeypatch.setattr(app, "ProcessPoolExecutor", sin_procesos)
+    estudio = estudio_factory(num_procesos=4, umbral_fragmentado=0)
+    texto = "Una sola línea sin saltos. Con dos oraciones y varios términos distintos."
+    assert estudio._fragmentar(texto) is None
+    assert estudio.extraer_conceptos_clave(texto)
+
+
+def test_ruta_serial_equivale_a_tfidf_vectorizer(estudios, texto_largo):
+    serial, _ = estudios
+    oraciones, vocabulario, matriz = serial._calcular_matriz_oraciones(texto_largo)
+    vectorizer = TfidfVectorizer(stop_words=serial.stop_words)
+    esperada = vectorizer.fit_transform(oraciones)
+    assert list(vocabulario) == list(vectorizer.get_feature_names_out())
+    assert np.allclose(matriz.toarray(), esperada.toarray(), rtol=0, atol=1e-12)
+
+
+def test_resumen_corto_sin_vocabulario_devuelve_el_texto(estudio_factory):
+    estudio = estudio_factory()
+    assert estudio.generar_resumen("De la el.", 3) == "De la el."
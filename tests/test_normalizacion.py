@@ -0,0 +1,78 @@
+import pytest
+
+import proyecto.app as app
+from proyecto.app import DocumentoVacioError, normalizar_paginas
+
+
+_TEMAS = ["álgebra", "botánica", "cálculo", "dinámica", "ecología", "física"]
+
+
+def _cuerpo(pagina):
+    return "\n".join(f"Contenido sobre {_TEMAS[pagina]} línea {c}." for c in "abcdefgh")
+
+
+def test_elimina_encabezados_repetidos_y_numeros_de_pagina():
+    paginas = [f"Revista de Ciencia Vol. 3\n{_cuerpo(i)}\nPágina {i} de 5" for i in range(1, 6)]
+    reporte = normalizar_paginas(paginas)
+    assert "Revista de Ciencia" not in reporte["texto"]
+    assert "Página" not in reporte["texto"]
+    assert reporte["lineas_eliminadas"] == 10
+    assert reporte["caracteres_eliminados"] > 0
+
+
+def test_elimina_numero_de_pagina_en_extremo_sin_repeticion():
+    paginas = [f"{_cuerpo(i)}\n{i}" for i in range(1, 3)]
+    texto = normalizar_paginas(paginas)["texto"]
+    assert texto.splitlines()[-1] == "Contenido sobre cálculo línea h."
+    assert "\n1\n" not in texto
+
+
+def test_conserva_numeros_del_cuerpo():
+    paginas = [
+        "Cronología del proyecto.\nInicio:\n1990\nCambio de sede en\n2005\nfin del primer periodo.\n"
+        + _cuerpo(1) + "\nCierre del capítulo.",
+        _cuerpo(2),
+    ]
+    lineas = normalizar_paginas(paginas)["texto"].splitlines()
+    assert "1990" in lineas
+    assert "2005" in lineas
+
+
+def test_conserva_numero_que_no_es_el_de_la_pagina():
+    texto = normalizar_paginas(["Informe anual del año\n2023"])["texto"]
+    assert texto.splitlines()[-1] == "2023"
+
+
+def test_une_palabras_cortadas_con_guion():
+    reporte = normalizar_paginas(["La investi-\ngación continúa en el labora-\ntorio."])
+    assert reporte["texto"] == "La investigación continúa en el laboratorio."
+    assert reporte["palabras_unidas"] == 2
+
+
+def test_leer_pdf_con_reporte_vacio_tras_limpieza(monkeypatch):
+    monkeypatch.setattr(app, "extraer_paginas_pdf", lambda ruta: ["1", "2", "3"])
+    with pytest.raises(DocumentoVacioError):
+        app.leer_pdf_con_reporte("documento.pdf")
+
+
+def test_paginas_cortas_conservan_el_cuerpo():
+    paginas = [
+        f"Ejercicio {i}.\nCalcule la derivada de la función f{i}.\nJustifique su respuesta.\nPágina {i}"
+        for i in range(1, 7)
+    ]
+    reporte = normalizar_paginas(paginas)
+    lineas = reporte["texto"].splitlines()
+    assert lineas.count("Justifique su respuesta.") == 6
+    assert "Calcule la derivada de la función f4." in lineas
+    assert not any(linea.startswith("Página") for linea in lineas)
+    assert reporte["lineas_eliminadas"] == 6
+
+
+def test_lineas_que_solo_difieren_en_digitos_no_son_encabezados():
+    paginas = [
+        f"Ejercicio {i} de la serie.\n{_cuerpo(i % len(_TEMAS))}\nVer tabla {i} al final."
+        for i in range(1, 6)
+    ]
+    lineas = normalizar_paginas(paginas)["texto"].splitlines()
+    assert "Ejercicio 3 de la serie." in lineas
+    assert "Ver tabla 5 al final." in lineas
@@ -0,0 +1,35 @@
+import numpy as np
+
+TEXTO = (
+    "La célula es la unidad básica de la vida. El núcleo de la célula contiene ADN. "
+    "La membrana protege la célula. Las mitocondrias producen energía para la célula. "
+    "El ADN guarda la información genética. La energía se almacena como ATP."
+)
+
+
+def test_respuestas_coinciden_con_busqueda_exhaustiva(estudio_factory):
+    estudio = estudio_factory()
+    resultados = estudio.generar_preguntas_con_respuestas(TEXTO, num_preguntas=4, num_respuestas=2)
+    oraciones, vocabulario, matriz = estudio._matriz_oraciones(TEXTO)
+    indice = {termino: i for i, termino in enumerate(vocabulario)}
+    densa = matriz.toarray()
+
+    assert resultados
+    for entrada in resultados:
+        columnas = [indice[concepto] for concepto in entrada["conceptos"]]
+        puntuaciones = densa[:, columnas].sum(axis=1)
+        candidatas = [i for i in np.argsort(-puntuaciones, kind="stable") if puntuaciones[i] > 0]
+        assert entrada["respuestas"] == [oraciones[i] for i in candidatas[:2]]
+
+
+def test_matriz_de_oraciones_se_reutiliza(estudio_factory):
+    estudio = estudio_factory()
+    estudio.crear_ficha_preguntas(TEXTO)
+    fallos = estudio.estadisticas_cache()["fallos"]
+    estudio.crear_ficha_preguntas(TEXTO)
+    estudio.generar_resumen(TEXTO, 2)
+
+    estadisticas = estudio.estadisticas_cache()
+    assert estadisticas["fallos"] == fallos + 1
+    assert estadisticas["aciertos_memoria"] >= 4
+